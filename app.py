@@ -3,34 +3,200 @@ Azure Container App - Python application connecting to Cosmos DB and Key Vault
 using User-Assigned Managed Identity
 """
 import os
+import functools
 import logging
+import time
+import orjson
+import requests
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from threading import RLock
+from azure.core import MatchConditions
+from azure.core.pipeline.transport import RequestsTransport
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
-from azure.identity import DefaultAzureCredential
+from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
 from azure.keyvault.secrets import SecretClient
-from flask import Flask, jsonify, request
+from cachetools import TTLCache
+from flask import Flask, Response, request, stream_with_context
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from werkzeug.exceptions import RequestEntityTooLarge
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+# Bound the size of request bodies read into memory
+app.config['MAX_CONTENT_LENGTH'] = 1_000_000
 
 # Cosmos DB configuration from environment variables
 COSMOS_ENDPOINT = os.getenv("COSMOS_ENDPOINT")
 DATABASE_NAME = os.getenv("COSMOS_DATABASE_NAME", "SampleDB")
 CONTAINER_NAME = os.getenv("COSMOS_CONTAINER_NAME", "Items")
 
+# TCP connect timeout for Cosmos DB calls, in seconds (SDK default is 60)
+COSMOS_CONNECT_TIMEOUT = int(os.getenv("COSMOS_CONNECT_TIMEOUT", "5"))
+# Read timeout for all outbound HTTP calls, in seconds (azure-core default is 300)
+HTTP_READ_TIMEOUT = int(os.getenv("HTTP_READ_TIMEOUT", "10"))
+
+# Page size used when streaming items out of Cosmos DB
+ITEMS_PAGE_SIZE = 100
+
+# Client ID of the user-assigned managed identity
+AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")
+# Managed identity endpoint, set by the platform inside Container Apps
+IDENTITY_ENDPOINT = os.getenv("IDENTITY_ENDPOINT")
+
+# Shared pool for Cosmos DB / Key Vault calls. Request threads wait on it with a
+# bounded timeout, and batch writes fan out across it. Only used after fork:
+# worker threads started in the gunicorn master would not exist in the workers.
+IO_TIMEOUT = int(os.getenv("IO_TIMEOUT", "10"))
+_io_pool = ThreadPoolExecutor(max_workers=32)
+
+# Cosmos DB allows at most 100 operations in one transactional batch
+COSMOS_BATCH_LIMIT = 100
+# Most batches one request may have running on the I/O pool at a time
+MAX_BATCHES_IN_FLIGHT = 4
+
+# Recently read items keyed by (id, category), stored as (item, read time).
+# Entries younger than ITEM_CACHE_FRESH seconds are served without calling
+# Cosmos DB; older ones are revalidated with the item's ETag so an unchanged
+# document comes back as a 304 with no body. Like the secret cache this is per
+# worker process, so writes handled by another worker show up after at most
+# ITEM_CACHE_FRESH seconds.
+ITEM_CACHE_FRESH = float(os.getenv("ITEM_CACHE_FRESH", "5"))
+_item_cache = TTLCache(maxsize=10_000, ttl=60)
+# Bumped on every item write so reads that raced with it do not re-cache stale data
+_item_writes = 0
+_item_lock = RLock()
+
 # Key Vault configuration
 KEY_VAULT_URL = os.getenv("KEY_VAULT_URL")
-
-# Initialize clients with Managed Identity
-credential = DefaultAzureCredential()
+KEY_VAULT_SCOPE = "https://vault.azure.net/.default"
+
+# In-process cache for Key Vault reads to avoid a round trip on every request.
+# Each worker process has its own cache, so a write is only invalidated locally
+# and other workers may serve the previous value for up to KV_CACHE_TTL seconds.
+KV_CACHE_TTL = int(os.getenv("KV_CACHE_TTL", "30"))
+_SECRET_LIST_KEY = object()
+_secret_cache = TTLCache(maxsize=256, ttl=KV_CACHE_TTL)
+# Bumped on every write so reads that raced with it do not re-cache stale data
+_secret_generations = {}
+_secret_lock = RLock()
+
+# Shared HTTP session so Cosmos DB and Key Vault calls reuse pooled keep-alive
+# connections instead of paying a TCP/TLS handshake per request
+_session = requests.Session()
+# Retries are left to the SDK pipelines so failures are not retried twice
+_adapter = HTTPAdapter(pool_connections=50, pool_maxsize=100, max_retries=Retry(0))
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+_transport = RequestsTransport(session=_session, session_owner=False, read_timeout=HTTP_READ_TIMEOUT)
+
+# Initialize clients with Managed Identity. When a managed identity endpoint is
+# available, go straight to it instead of letting DefaultAzureCredential probe
+# every credential type on each token fetch. Elsewhere (local development, CI
+# with a service principal) keep the full DefaultAzureCredential chain.
+if IDENTITY_ENDPOINT:
+    credential = ManagedIdentityCredential(client_id=AZURE_CLIENT_ID, transport=_transport)
+else:
+    credential = DefaultAzureCredential(managed_identity_client_id=AZURE_CLIENT_ID)
 cosmos_client = None
 database = None
 container = None
 keyvault_client = None
 
 
+def ojsonify(obj, status=200):
+    """Build a JSON response using orjson instead of Flask's stdlib encoder"""
+    return Response(orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC), status=status, mimetype='application/json')
+
+
+# Static error bodies, encoded once at import instead of on every request
+ERR_NO_COSMOS = (orjson.dumps({"error": "Cosmos DB not initialized"}), 500)
+ERR_NO_KEYVAULT = (orjson.dumps({"error": "Key Vault not initialized"}), 500)
+ERR_NO_BODY = (orjson.dumps({"error": "Request body is required"}), 400)
+ERR_NO_ID_CATEGORY = (orjson.dumps({"error": "id and category fields are required"}), 400)
+ERR_NO_CATEGORY_FIELD = (orjson.dumps({"error": "category field is required"}), 400)
+ERR_NO_SECRET_VALUE = (orjson.dumps({"error": "Request body must contain 'value' field"}), 400)
+ERR_ITEM_NOT_FOUND = (orjson.dumps({"error": "Item not found"}), 404)
+ERR_ITEM_EXISTS = (orjson.dumps({"error": "Item already exists"}), 409)
+ERR_BODY_TOO_LARGE = (orjson.dumps({"error": "Request body is too large"}), 413)
+ERR_UPSTREAM_TIMEOUT = (orjson.dumps({"error": "Upstream service timed out"}), 504)
+
+
+def fast_json():
+    """Parse the request body with orjson instead of Flask's stdlib parser"""
+    return orjson.loads(request.get_data(cache=False) or b'null')
+
+
+def require_args(*names):
+    """Pass the named query parameters to the view as keyword arguments, or return a 400 if any is missing"""
+    if len(names) == 1:
+        message = f"{names[0]} query parameter is required"
+    else:
+        message = f"{' and '.join(names)} query parameters are required"
+    # Encoded once per decorated view, like the ERR_* constants
+    error = (orjson.dumps({"error": message}), 400)
+    
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            values = [request.args.get(name) for name in names]
+            if not all(values):
+                return err(error)
+            return fn(*args, **kwargs, **dict(zip(names, values)))
+        return wrapper
+    return decorator
+
+
+def run_io(fn, *args, **kwargs):
+    """Run a blocking SDK call on the shared I/O pool and wait at most IO_TIMEOUT seconds"""
+    return _io_pool.submit(fn, *args, **kwargs).result(timeout=IO_TIMEOUT)
+
+
+def err(error):
+    """Return a precompiled (body, status) error as a JSON response"""
+    body, status = error
+    return Response(body, status=status, mimetype='application/json')
+
+
+def _secret_key(key):
+    """Normalize a Key Vault cache key; secret names are case-insensitive"""
+    return key.lower() if isinstance(key, str) else key
+
+
+def _get_cached_secret(key):
+    """Return (cached value or None, generation) for a Key Vault cache key"""
+    key = _secret_key(key)
+    with _secret_lock:
+        return _secret_cache.get(key), _secret_generations.get(key, 0)
+
+
+def _cache_secret(key, generation, value):
+    """Cache a Key Vault read unless the key was written since the read started"""
+    key = _secret_key(key)
+    with _secret_lock:
+        if _secret_generations.get(key, 0) == generation:
+            _secret_cache[key] = value
+
+
+def _invalidate_secret(*keys):
+    """Drop cached Key Vault reads and fence off in-flight reads of the same keys"""
+    with _secret_lock:
+        for key in map(_secret_key, keys):
+            _secret_cache.pop(key, None)
+            _secret_generations[key] = _secret_generations.get(key, 0) + 1
+
+
+def _invalidate_item(key):
+    """Drop a cached item and fence off in-flight reads that started before the write"""
+    global _item_writes
+    with _item_lock:
+        _item_cache.pop(key, None)
+        _item_writes += 1
+
+
 def initialize_cosmos_client():
     """Initialize Cosmos DB client with managed identity authentication"""
     global cosmos_client, database, container
@@ -41,8 +207,15 @@ def initialize_cosmos_client():
         
         logger.info(f"Connecting to Cosmos DB at {COSMOS_ENDPOINT}")
         
-        # Create Cosmos client using managed identity
-        cosmos_client = CosmosClient(COSMOS_ENDPOINT, credential=credential)
+        # Create Cosmos client using managed identity. The Python SDK only supports
+        # Gateway mode, so tune the connect timeout and pin Session consistency instead.
+        cosmos_client = CosmosClient(
+            COSMOS_ENDPOINT,
+            credential=credential,
+            consistency_level="Session",
+            connection_timeout=COSMOS_CONNECT_TIMEOUT,
+            transport=_transport
+        )
         
         # Get or create database
         database = cosmos_client.create_database_if_not_exists(id=DATABASE_NAME)
@@ -74,29 +247,15 @@ def initialize_keyvault_client():
         logger.info(f"Connecting to Key Vault at {KEY_VAULT_URL}")
         
         # Create Key Vault client using managed identity
-        keyvault_client = SecretClient(vault_url=KEY_VAULT_URL, credential=credential)
+        keyvault_client = SecretClient(vault_url=KEY_VAULT_URL, credential=credential, transport=_transport)
         logger.info("Key Vault client initialized successfully")
         
-        return True
-    except Exception as e:
-        logger.error(f"Failed to initialize Cosmos DB client: {str(e)}")
-        return False
-
-
-def initialize_keyvault_client():
-    """Initialize Key Vault client with managed identity authentication"""
-    global keyvault_client
-    
-    try:
-        if not KEY_VAULT_URL:
-            logger.warning("KEY_VAULT_URL environment variable is not set")
-            return False
-        
-        logger.info(f"Connecting to Key Vault at {KEY_VAULT_URL}")
-        
-        # Create Key Vault client using managed identity
-        keyvault_client = SecretClient(vault_url=KEY_VAULT_URL, credential=credential)
-        logger.info("Key Vault client initialized successfully")
+        # SecretClient makes no calls until first use, so fetch the token now
+        # rather than on the first /secrets request
+        try:
+            credential.get_token(KEY_VAULT_SCOPE)
+        except Exception as e:
+            logger.warning(f"Could not pre-fetch Key Vault token: {str(e)}")
         
         return True
     except Exception as e:
@@ -104,14 +263,16 @@ def initialize_keyvault_client():
         return False
 
 
+# Connection flags can change, so /health fills them into a prebuilt template
+_HEALTH_TEMPLATE = b'{"status":"healthy","cosmos_connected":%s,"keyvault_connected":%s}'
+_JSON_BOOL = {True: b"true", False: b"false"}
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "cosmos_connected": cosmos_client is not None,
-        "keyvault_connected": keyvault_client is not None
-    }), 200
+    body = _HEALTH_TEMPLATE % (_JSON_BOOL[cosmos_client is not None], _JSON_BOOL[keyvault_client is not None])
+    return Response(body, status=200, mimetype='application/json')
 
 
 @app.route('/items', methods=['GET'])
@@ -119,59 +280,188 @@ def get_items():
     """Get all items from Cosmos DB"""
     try:
         if not container:
-            return jsonify({"error": "Cosmos DB not initialized"}), 500
+            return err(ERR_NO_COSMOS)
+        
+        items = iter(container.read_all_items(max_item_count=ITEMS_PAGE_SIZE))
+        # Pull the first page before streaming so connection errors still map to a 500
+        first = run_io(next, items, None)
+        
+        def generate():
+            if first is None:
+                yield b'{"items":[],"count":0}'
+                return
+            yield b'{"items":[' + orjson.dumps(first)
+            count = 1
+            try:
+                for item in items:
+                    yield b',' + orjson.dumps(item)
+                    count += 1
+            except Exception as e:
+                # Headers are already sent, so re-raise to abort the connection and
+                # let the client see an incomplete response instead of a clean 200
+                logger.error(f"Error streaming items after {count} items: {str(e)}")
+                raise
+            yield b'],"count":%d}' % count
         
-        items = list(container.read_all_items())
-        return jsonify({
-            "count": len(items),
-            "items": items
-        }), 200
+        return Response(stream_with_context(generate()), status=200, mimetype='application/json')
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error fetching items: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/items/<item_id>', methods=['GET'])
-def get_item(item_id):
+@require_args('category')
+def get_item(item_id, category):
     """Get a specific item by ID"""
     try:
         if not container:
-            return jsonify({"error": "Cosmos DB not initialized"}), 500
+            return err(ERR_NO_COSMOS)
         
-        category = request.args.get('category')
-        if not category:
-            return jsonify({"error": "category query parameter is required"}), 400
+        key = (item_id, category)
+        with _item_lock:
+            cached = _item_cache.get(key)
+            writes = _item_writes
         
-        item = container.read_item(item=item_id, partition_key=category)
-        return jsonify(item), 200
+        if cached is None:
+            item = run_io(container.read_item, item=item_id, partition_key=category)
+        else:
+            cached_item, read_at = cached
+            if time.monotonic() - read_at < ITEM_CACHE_FRESH:
+                return ojsonify(cached_item)
+            item = run_io(
+                container.read_item,
+                item=item_id,
+                partition_key=category,
+                etag=cached_item["_etag"],
+                match_condition=MatchConditions.IfModified
+            )
+            # The SDK returns no body when Cosmos DB answers 304 Not Modified
+            if item is None:
+                item = cached_item
+        
+        with _item_lock:
+            if _item_writes == writes:
+                _item_cache[key] = (item, time.monotonic())
+        return ojsonify(item)
     except exceptions.CosmosResourceNotFoundError:
-        return jsonify({"error": "Item not found"}), 404
+        return err(ERR_ITEM_NOT_FOUND)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error fetching item: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
+
+
+def create_items_batch(items):
+    """Create many items using one transactional batch per category.
+    
+    Each batch of up to COSMOS_BATCH_LIMIT items in the same category is atomic.
+    Up to MAX_BATCHES_IN_FLIGHT batches run concurrently, and the whole request
+    shares a single IO_TIMEOUT deadline. On failure no further batches are
+    started; the error response lists the request indexes that were committed
+    and, after a timeout, those whose batch was still running.
+    """
+    if not all(isinstance(item, dict) and 'id' in item and 'category' in item for item in items):
+        return err(ERR_NO_ID_CATEGORY)
+    
+    # Group by partition key, remembering each item's position in the request
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(item['category'], []).append(index)
+    chunks = [
+        (category, indexes[start:start + COSMOS_BATCH_LIMIT])
+        for category, indexes in groups.items()
+        for start in range(0, len(indexes), COSMOS_BATCH_LIMIT)
+    ]
+    
+    created = [None] * len(items)
+    committed = []
+    in_flight = {}
+    failure = None
+    next_chunk = 0
+    deadline = time.monotonic() + IO_TIMEOUT
+    
+    while in_flight or (failure is None and next_chunk < len(chunks)):
+        # Batches for different categories are independent, so run a few at once
+        while failure is None and next_chunk < len(chunks) and len(in_flight) < MAX_BATCHES_IN_FLIGHT:
+            category, chunk = chunks[next_chunk]
+            next_chunk += 1
+            future = _io_pool.submit(
+                container.execute_item_batch,
+                batch_operations=[("create", (items[i],)) for i in chunk],
+                partition_key=category
+            )
+            in_flight[future] = chunk
+        
+        done, _ = wait(in_flight, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            chunk = in_flight.pop(future)
+            try:
+                results = future.result()
+            except Exception as e:
+                failure = failure or (e, chunk)
+                continue
+            for i, result in zip(chunk, results):
+                created[i] = result["resourceBody"]
+            committed.extend(chunk)
+    
+    if in_flight:
+        # Deadline passed: drop batches still queued on the pool; the rest may yet commit
+        unknown = sorted(i for future, chunk in in_flight.items() if not future.cancel() for i in chunk)
+        logger.error(f"Timed out creating items in batch; {len(committed)} committed, {len(unknown)} unknown")
+        return ojsonify({
+            "error": "Upstream service timed out",
+            "committed": sorted(committed),
+            "unknown": unknown
+        }, 504)
+    
+    if failure is not None:
+        e, chunk = failure
+        body = {"error": str(e), "committed": sorted(committed)}
+        status = getattr(e, 'status_code', None) or 500
+        if isinstance(e, exceptions.CosmosBatchOperationError):
+            body["index"] = chunk[e.error_index]
+            if status == 409:
+                body["error"] = "Item already exists"
+        if status != 409:
+            logger.error(f"Error creating items in batch: {str(e)}")
+        return ojsonify(body, status)
+    
+    return ojsonify({"count": len(created), "items": created}, 201)
 
 
 @app.route('/items', methods=['POST'])
 def create_item():
-    """Create a new item in Cosmos DB"""
+    """Create a new item (or a JSON array of items) in Cosmos DB"""
     try:
         if not container:
-            return jsonify({"error": "Cosmos DB not initialized"}), 500
+            return err(ERR_NO_COSMOS)
         
-        data = request.get_json()
+        data = fast_json()
         if not data:
-            return jsonify({"error": "Request body is required"}), 400
+            return err(ERR_NO_BODY)
+        
+        if isinstance(data, list):
+            return create_items_batch(data)
         
         if 'id' not in data or 'category' not in data:
-            return jsonify({"error": "id and category fields are required"}), 400
+            return err(ERR_NO_ID_CATEGORY)
         
-        created_item = container.create_item(body=data)
-        return jsonify(created_item), 201
+        created_item = run_io(container.create_item, body=data)
+        return ojsonify(created_item, 201)
     except exceptions.CosmosResourceExistsError:
-        return jsonify({"error": "Item already exists"}), 409
+        return err(ERR_ITEM_EXISTS)
+    except RequestEntityTooLarge:
+        return err(ERR_BODY_TOO_LARGE)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error creating item: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/items/<item_id>', methods=['PUT'])
@@ -179,43 +469,48 @@ def update_item(item_id):
     """Update an existing item"""
     try:
         if not container:
-            return jsonify({"error": "Cosmos DB not initialized"}), 500
+            return err(ERR_NO_COSMOS)
         
-        data = request.get_json()
+        data = fast_json()
         if not data:
-            return jsonify({"error": "Request body is required"}), 400
+            return err(ERR_NO_BODY)
         
         if 'category' not in data:
-            return jsonify({"error": "category field is required"}), 400
+            return err(ERR_NO_CATEGORY_FIELD)
         
         # Ensure the ID in the body matches the URL parameter
         data['id'] = item_id
         
-        updated_item = container.upsert_item(body=data)
-        return jsonify(updated_item), 200
+        updated_item = run_io(container.upsert_item, body=data)
+        _invalidate_item((item_id, data['category']))
+        return ojsonify(updated_item)
+    except RequestEntityTooLarge:
+        return err(ERR_BODY_TOO_LARGE)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error updating item: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/items/<item_id>', methods=['DELETE'])
-def delete_item(item_id):
+@require_args('category')
+def delete_item(item_id, category):
     """Delete an item"""
     try:
         if not container:
-            return jsonify({"error": "Cosmos DB not initialized"}), 500
-        
-        category = request.args.get('category')
-        if not category:
-            return jsonify({"error": "category query parameter is required"}), 400
+            return err(ERR_NO_COSMOS)
         
-        container.delete_item(item=item_id, partition_key=category)
-        return jsonify({"message": "Item deleted successfully"}), 200
+        run_io(container.delete_item, item=item_id, partition_key=category)
+        _invalidate_item((item_id, category))
+        return ojsonify({"message": "Item deleted successfully"})
     except exceptions.CosmosResourceNotFoundError:
-        return jsonify({"error": "Item not found"}), 404
+        return err(ERR_ITEM_NOT_FOUND)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error deleting item: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/secrets', methods=['GET'])
@@ -223,18 +518,27 @@ def list_secrets():
     """List all secret names from Key Vault"""
     try:
         if not keyvault_client:
-            return jsonify({"error": "Key Vault not initialized"}), 500
+            return err(ERR_NO_KEYVAULT)
         
-        secret_properties = keyvault_client.list_properties_of_secrets()
+        cached, generation = _get_cached_secret(_SECRET_LIST_KEY)
+        if cached is not None:
+            return ojsonify(cached)
+        
+        secret_properties = run_io(list, keyvault_client.list_properties_of_secrets())
         secrets = [{"name": secret.name, "enabled": secret.enabled} for secret in secret_properties]
         
-        return jsonify({
+        result = {
             "count": len(secrets),
             "secrets": secrets
-        }), 200
+        }
+        _cache_secret(_SECRET_LIST_KEY, generation, result)
+        
+        return ojsonify(result)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error listing secrets: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/secrets/<secret_name>', methods=['GET'])
@@ -242,20 +546,29 @@ def get_secret(secret_name):
     """Get a specific secret value from Key Vault"""
     try:
         if not keyvault_client:
-            return jsonify({"error": "Key Vault not initialized"}), 500
+            return err(ERR_NO_KEYVAULT)
+        
+        cached, generation = _get_cached_secret(secret_name)
+        if cached is not None:
+            return ojsonify(cached)
         
-        secret = keyvault_client.get_secret(secret_name)
+        secret = run_io(keyvault_client.get_secret, secret_name)
         
-        return jsonify({
+        result = {
             "name": secret.name,
             "value": secret.value,
             "enabled": secret.properties.enabled,
-            "created_on": secret.properties.created_on.isoformat() if secret.properties.created_on else None,
-            "updated_on": secret.properties.updated_on.isoformat() if secret.properties.updated_on else None
-        }), 200
+            "created_on": secret.properties.created_on,
+            "updated_on": secret.properties.updated_on
+        }
+        _cache_secret(secret_name, generation, result)
+        
+        return ojsonify(result)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error getting secret '{secret_name}': {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
 
 
 @app.route('/secrets/<secret_name>', methods=['POST'])
@@ -263,47 +576,62 @@ def set_secret(secret_name):
     """Set or update a secret in Key Vault"""
     try:
         if not keyvault_client:
-            return jsonify({"error": "Key Vault not initialized"}), 500
+            return err(ERR_NO_KEYVAULT)
         
-        data = request.get_json()
+        data = fast_json()
         if not data or 'value' not in data:
-            return jsonify({"error": "Request body must contain 'value' field"}), 400
+            return err(ERR_NO_SECRET_VALUE)
         
-        secret = keyvault_client.set_secret(secret_name, data['value'])
+        secret = run_io(keyvault_client.set_secret, secret_name, data['value'])
         
-        return jsonify({
+        # Drop stale cached reads so the new value is visible immediately
+        _invalidate_secret(secret_name, _SECRET_LIST_KEY)
+        
+        return ojsonify({
             "name": secret.name,
             "message": "Secret created/updated successfully",
-            "created_on": secret.properties.created_on.isoformat() if secret.properties.created_on else None
-        }), 201
+            "created_on": secret.properties.created_on
+        }, 201)
+    except RequestEntityTooLarge:
+        return err(ERR_BODY_TOO_LARGE)
+    except FutureTimeoutError:
+        return err(ERR_UPSTREAM_TIMEOUT)
     except Exception as e:
         logger.error(f"Error setting secret '{secret_name}': {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}, 500)
+
+
+# The API description never changes, so encode it once at import
+_HOME_BODY = orjson.dumps({
+    "name": "Azure Container App - Cosmos DB & Key Vault Demo",
+    "description": "Python app using User-Assigned Managed Identity",
+    "endpoints": {
+        "GET /health": "Health check",
+        "GET /items": "Get all items from Cosmos DB",
+        "GET /items/<id>?category=<cat>": "Get specific item",
+        "POST /items": "Create new item (or array of items)",
+        "PUT /items/<id>": "Update item",
+        "DELETE /items/<id>?category=<cat>": "Delete item",
+        "GET /secrets": "List all secrets from Key Vault",
+        "GET /secrets/<name>": "Get secret value",
+        "POST /secrets/<name>": "Set/update secret"
+    }
+})
 
 
 @app.route('/', methods=['GET'])
 def home():
     """Root endpoint with API information"""
-    return jsonify({
-        "name": "Azure Container App - Cosmos DB & Key Vault Demo",
-        "description": "Python app using User-Assigned Managed Identity",
-        "endpoints": {
-            "GET /health": "Health check",
-            "GET /items": "Get all items from Cosmos DB",
-            "GET /items/<id>?category=<cat>": "Get specific item",
-            "POST /items": "Create new item",
-            "PUT /items/<id>": "Update item",
-            "DELETE /items/<id>?category=<cat>": "Delete item",
-            "GET /secrets": "List all secrets from Key Vault",
-            "GET /secrets/<name>": "Get secret value",
-            "POST /secrets/<name>": "Set/update secret"
-        }
-    }), 200
+    return Response(_HOME_BODY, status=200, mimetype='application/json')
 
 
-# Initialize Cosmos DB and Key Vault when module loads (needed for Gunicorn)
-initialize_cosmos_client()
-initialize_keyvault_client()
+# Initialize Cosmos DB and Key Vault when module loads (needed for Gunicorn).
+# Both do DNS, TLS and token round trips, so run them concurrently.
+with ThreadPoolExecutor(max_workers=2) as _init_pool:
+    _cosmos_init = _init_pool.submit(initialize_cosmos_client)
+    _keyvault_init = _init_pool.submit(initialize_keyvault_client)
+    _cosmos_init.result()
+    _keyvault_init.result()
 
 if __name__ == '__main__':
     # This block runs only when using python app.py directly
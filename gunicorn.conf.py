@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration for the Azure Container App
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+# Requests spend most of their time waiting on Cosmos DB and Key Vault, so
+# threaded workers let each process keep many of those calls in flight
+worker_class = "gthread"
+workers = 2
+threads = 16
+timeout = 60
+
+# Keep client connections open between requests from the Container Apps ingress
+keepalive = 75
+
+# Load the app (and initialize the Cosmos DB and Key Vault clients) once in the
+# master before forking workers
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Drop pooled connections inherited from the master process"""
+    # Sockets opened during startup must not be shared between workers; closing
+    # the session empties its pools so each worker opens its own connections
+    import app
+    app._session.close()